@@ -0,0 +1,144 @@
+import base64
+import mimetypes
+import os
+import posixpath
+import re
+
+# <link href="/index.css" rel="stylesheet">
+LINK_TAG = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+ATTRIBUTE = re.compile(r"""([\w-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+# url(a.png), url("a.png") or url('a.png')
+CSS_URL = re.compile(r"""url\(\s*(?:"([^"]*)"|'([^']*)'|([^)'"\s]*))\s*\)""")
+
+
+def file_key(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def attributes(tag):
+    return {
+        name.lower(): double if double is not None else single
+        for name, double, single in ATTRIBUTE.findall(tag)
+    }
+
+
+class AssetInliner:
+    def __init__(self, static_dir="static", css_limit=0, image_limit=0):
+        self.static_dir = static_dir
+        self.css_limit = css_limit
+        self.image_limit = image_limit
+        # path -> ((mtime, size), value), value is None when not inlined
+        self.cache = {}
+
+    def local_path(self, url):
+        # Only site absolute urls served from `static_dir` can be inlined
+        if not url.startswith("/") or url.startswith("//"):
+            return None
+        url = url.split("?", maxsplit=1)[0].split("#", maxsplit=1)[0]
+        path = os.path.join(self.static_dir, *posixpath.normpath(url).split("/"))
+        return path if os.path.isfile(path) else None
+
+    def cached(self, path, limit, process):
+        key = file_key(path)
+        cached = self.cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        value = None
+        if key[1] <= limit:
+            value = process(path)
+        self.cache[path] = (key, value)
+        return value
+
+    def data_uri(self, url):
+        path = self.local_path(url)
+        if path is None:
+            return None
+        return self.cached(path, self.image_limit, self.encode)
+
+    def encode(self, path):
+        mime, _ = mimetypes.guess_type(path)
+        if mime is None or not mime.startswith("image/"):
+            return None
+        with open(path, "rb") as file:
+            data = base64.b64encode(file.read()).decode("ascii")
+        return f"data:{mime};base64,{data}"
+
+    def stylesheet(self, href):
+        # Returns the processed css and the local images it refers to
+        path = self.local_path(href)
+        if path is None:
+            return None
+
+        cached = self.cache.get(path)
+        if cached is not None and cached[0] == self.stylesheet_key(path, cached[1]):
+            return cached[1]
+
+        value = None
+        if file_key(path)[1] <= self.css_limit:
+            value = self.process_css(path, href)
+        self.cache[path] = (self.stylesheet_key(path, value), value)
+        return value
+
+    def stylesheet_key(self, path, value):
+        # NOTE: the css embeds its images, so it is stale when any of them is
+        images = value[1] if value is not None else []
+        try:
+            return tuple(file_key(path) for path in [path, *images])
+        except FileNotFoundError:
+            return None
+
+    def process_css(self, path, href):
+        with open(path, "r") as file:
+            css = file.read()
+        if "</style" in css.lower():
+            return None
+
+        # NOTE: relative urls were relative to the stylesheet, once inlined
+        # they would resolve against the page instead
+        base = posixpath.dirname(href)
+        images = []
+
+        def replace(match):
+            url = next(group for group in match.groups() if group is not None)
+            if url == "" or url.startswith(("data:", "#")) or ":" in url:
+                return match.group()
+            if not url.startswith("/"):
+                url = posixpath.normpath(posixpath.join(base, url))
+            # Tracked even when not embedded, it may shrink under the limit
+            image = self.local_path(url)
+            if image is not None:
+                images.append(image)
+            uri = self.data_uri(url)
+            return f'url("{uri or url}")'
+
+        return CSS_URL.sub(replace, css), images
+
+    def inline_html(self, html):
+        # Returns the html and the static files it now depends on
+        dependencies = []
+
+        def replace(match):
+            attrs = attributes(match.group())
+            if attrs.get("rel", "").lower() != "stylesheet" or "href" not in attrs:
+                return match.group()
+            stylesheet = self.stylesheet(attrs["href"])
+            if stylesheet is None:
+                return match.group()
+            css, images = stylesheet
+            dependencies.append(self.local_path(attrs["href"]))
+            dependencies.extend(images)
+            media = attrs.get("media")
+            media = f' media="{media}"' if media else ""
+            return f"<style{media}>{css}</style>"
+
+        return LINK_TAG.sub(replace, html), dependencies
+
+    def inline_images(self, node):
+        if node.tag == "img" and node.props and "src" in node.props:
+            uri = self.data_uri(node.props["src"])
+            if uri is not None:
+                node.props["src"] = uri
+        for child in node.children or []:
+            self.inline_images(child)
@@ -0,0 +1,66 @@
+import argparse
+import html
+import timeit
+from unittest import mock
+
+import htmlnode
+from markdown import markdown_to_html_node
+
+PARAGRAPH = (
+    "In the annals of fantasy literature, few sagas can rival the **tapestry** "
+    "woven by *Tolkien*. You can find the [wiki here](https://lotr.fandom.com/wiki) "
+    "and the `Valar` and `Maiar` in [the index](/index?page=1&sort=asc)."
+)
+ESCAPED_PARAGRAPH = "Compare `a < b && b > c` with *x <= y* & [more](/q?a=1&b=2)."
+
+
+def make_page(paragraphs, escaped_ratio):
+    blocks = ["# A text heavy page"]
+    every = int(1 / escaped_ratio) if escaped_ratio else 0
+    for i in range(paragraphs):
+        blocks.append(ESCAPED_PARAGRAPH if every and i % every == 0 else PARAGRAPH)
+    return "\n\n".join(blocks)
+
+
+def identity(text):
+    return text
+
+
+def per_node_escape(text):
+    return html.escape(text, quote=False)
+
+
+def per_node_attr_escape(value):
+    return html.escape(value)
+
+
+def bench(node, number):
+    return min(timeit.repeat(node.to_html, number=number, repeat=5)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML escaping")
+    parser.add_argument("--paragraphs", type=int, default=2000)
+    parser.add_argument("--escaped-ratio", type=float, default=0.1)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    markdown = make_page(args.paragraphs, args.escaped_ratio)
+    node = markdown_to_html_node(markdown)
+
+    variants = {
+        "unescaped": (identity, identity),
+        "html.escape per node": (per_node_escape, per_node_attr_escape),
+        "built-in escaping": (htmlnode.escape_text, htmlnode.escape_attr),
+    }
+    baseline = None
+    for name, (text, attr) in variants.items():
+        with mock.patch.object(htmlnode, "escape_text", text):
+            with mock.patch.object(htmlnode, "escape_attr", attr):
+                seconds = bench(node, args.number)
+        baseline = baseline or seconds
+        print(f"{name:>22}: {seconds * 1000:8.3f} ms  ({seconds / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import json
+import os
+import socket
+import sys
+
+# NOTE: defined here, importing the daemon would pull in the whole build
+SOCKET_PATH = ".build.sock"
+
+
+def send(request, path=SOCKET_PATH):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        with sock.makefile("rb") as file:
+            return json.loads(file.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send requests to the build daemon")
+    parser.add_argument("--socket", type=str, help="Socket path", default=SOCKET_PATH)
+    parser.add_argument("command", choices=["build", "rebuild", "ping", "shutdown"])
+    parser.add_argument("paths", nargs="*", help="Changed files, for 'rebuild'")
+    args = parser.parse_args()
+
+    request = {"command": args.command}
+    if args.command == "rebuild":
+        request["paths"] = [os.path.abspath(path) for path in args.paths]
+
+    response = send(request, args.socket)
+    if not response["ok"]:
+        print(f"Build failed: {response['error']}", file=sys.stderr)
+        sys.exit(1)
+
+    timings = response.get("timings")
+    if timings:
+        print(
+            f"Built in {timings['total'] * 1000:.1f}ms: "
+            f"{timings['rendered']} rendered, {timings['cached']} cached"
+        )
+
+
+if __name__ == "__main__":
+    main()
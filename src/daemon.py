@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+import socketserver
+import time
+
+from client import SOCKET_PATH
+from main import add_inline_arguments, copy_to_dir, inline_assets, read_file
+from main import render_page, write_feeds
+from output import DIRECTORY, is_archive
+from shard import Manifest
+from template import load_template
+
+
+class Builder:
+    def __init__(
+        self,
+        content="content",
+        static="static",
+        template="template.html",
+        dest="public",
+        minify=False,
+        base_url=None,
+        assets=None,
+    ):
+        # NOTE: sources are always relative to the daemon's working directory
+        self.content = os.path.relpath(content)
+        self.static = os.path.relpath(static)
+        self.template = os.path.relpath(template)
+        self.dest = dest
+        self.minify = minify
+        self.base_url = base_url
+        self.assets = assets
+        # NOTE: rebuilds update `dest` in place, so it has to be a directory
+        self.output = DIRECTORY
+        self.manifest = None
+        # source -> ((mtime, size, template version), html, title, links)
+        self.pages = {}
+
+    def root_of(self, source):
+        # Returns the root `source` is under and the path relative to it
+        for root in [self.content, self.static]:
+            rel = os.path.relpath(source, root)
+            if not rel.startswith(os.pardir):
+                return root, rel
+        return None, None
+
+    def dest_for(self, source):
+        # content/a/b.md -> public/a/b.html, static/x.png -> public/x.png
+        root, rel = self.root_of(source)
+        if root is None:
+            return None
+
+        if root == self.content:
+            name, ext = os.path.splitext(rel)
+            if ext != ".md":
+                return None
+            rel = f"{name}.html"
+        return os.path.join(self.dest, rel)
+
+    def build_page(self, source, dest, timings):
+        stat = os.stat(source)
+        template = load_template(self.template, self.minify, self.assets)
+        key = (stat.st_mtime_ns, stat.st_size, template.version)
+
+        cached = self.pages.get(source)
+        if cached is not None and cached[0] == key:
+            _, html, title, links = cached
+            timings["cached"] += 1
+        else:
+            print(f"Generating page '{source}' to '{dest}'")
+            markdown = read_file(source)
+            html, title, links = render_page(
+                markdown, template, self.minify, self.assets
+            )
+            self.pages[source] = (key, html, title, links)
+            timings["rendered"] += 1
+
+        self.output.make_dir(os.path.dirname(dest))
+        self.output.write_text(dest, html)
+        self.manifest.add_page(dest, source, title, links, stat.st_mtime)
+
+    def full_build(self, timings):
+        start = time.perf_counter()
+        self.manifest = Manifest(self.dest)
+        copy_to_dir(self.static, self.dest, manifest=self.manifest, output=self.output)
+        timings["static"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for dir, dirs, names in os.walk(self.content):
+            dirs.sort()
+            for name in sorted(names):
+                source = os.path.join(dir, name)
+                dest = self.dest_for(source)
+                if dest is not None:
+                    self.build_page(source, dest, timings)
+
+        # Forget pages whose source is gone
+        sources = set(self.manifest.outputs.values())
+        for source in list(self.pages):
+            if source not in sources:
+                del self.pages[source]
+        timings["pages"] = time.perf_counter() - start
+
+    def rebuild(self, paths, timings):
+        if self.manifest is None:
+            return self.full_build(timings)
+
+        start = time.perf_counter()
+        sources = set(self.manifest.outputs.values())
+        for path in paths:
+            # Clients send absolute paths
+            path = os.path.relpath(path)
+            if path == self.template:
+                # Every page depends on the template
+                return self.full_build(timings)
+            if os.path.isdir(path):
+                return self.full_build(timings)
+            if not os.path.exists(path) and path not in sources:
+                if self.root_of(path)[0] is None:
+                    raise Exception(f"'{path}' is not part of the site")
+                # Most likely a deleted directory, its outputs are unknown
+                return self.full_build(timings)
+            if self.assets is not None and path in self.assets.cache:
+                # Pages may have embedded the old version
+                self.pages.clear()
+                return self.full_build(timings)
+
+            dest = self.dest_for(path)
+            if dest is None:
+                raise Exception(f"'{path}' is not part of the site")
+
+            if not os.path.exists(path):
+                print(f"Removing '{dest}'")
+                self.output.remove(dest)
+                self.manifest.remove(dest)
+                self.pages.pop(path, None)
+            elif dest.endswith(".html") and path.endswith(".md"):
+                self.build_page(path, dest, timings)
+            else:
+                print(f"Copying '{path}' to '{dest}'")
+                self.output.make_dir(os.path.dirname(dest))
+                self.output.copy_file(path, dest)
+                self.manifest.add_output(dest, path)
+        timings["pages"] = time.perf_counter() - start
+
+    def handle(self, request):
+        start = time.perf_counter()
+        timings = {"rendered": 0, "cached": 0}
+
+        match request.get("command"):
+            case "build":
+                self.full_build(timings)
+            case "rebuild":
+                self.rebuild(request.get("paths", []), timings)
+            case "ping":
+                return {"ok": True}
+            case command:
+                raise Exception(f"Unsupported command '{command}'")
+
+        # Feeds are regenerated from the manifest, no page is parsed again
+        feeds_start = time.perf_counter()
+        for path, source in list(self.manifest.outputs.items()):
+            if source is None:
+                self.manifest.remove(os.path.join(self.dest, path))
+        write_feeds(self.manifest, self.dest, self.base_url, self.output)
+        timings["feeds"] = time.perf_counter() - feeds_start
+        timings["total"] = time.perf_counter() - start
+        return {"ok": True, "timings": timings}
+
+
+class BuildRequestHandler(socketserver.StreamRequestHandler):
+    # One json request per line, answered by one json line
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if request.get("command") == "shutdown":
+                    response = {"ok": True}
+                    self.server.shutdown_requested = True
+                else:
+                    response = self.server.builder.handle(request)
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+            if self.server.shutdown_requested:
+                return
+
+
+class BuildServer(socketserver.UnixStreamServer):
+    def __init__(self, path, builder):
+        if os.path.exists(path):
+            os.remove(path)
+        super().__init__(path, BuildRequestHandler)
+        self.builder = builder
+        self.shutdown_requested = False
+
+    def serve_until_shutdown(self):
+        try:
+            while not self.shutdown_requested:
+                self.handle_request()
+        finally:
+            self.server_close()
+            os.remove(self.server_address)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm static site build daemon")
+    parser.add_argument("--socket", type=str, help="Socket path", default=SOCKET_PATH)
+    parser.add_argument("--out", type=str, help="Output directory", default="public")
+    parser.add_argument(
+        "--minify", action="store_true", help="Strip insignificant whitespace"
+    )
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        help="Site url used in sitemap.xml and atom.xml",
+        default="http://localhost:8888",
+    )
+    add_inline_arguments(parser)
+    args = parser.parse_args()
+    if is_archive(args.out):
+        parser.error("the daemon rebuilds in place, it needs a directory --out")
+
+    builder = Builder(
+        dest=args.out,
+        minify=args.minify,
+        base_url=args.base_url,
+        assets=inline_assets(args),
+    )
+    server = BuildServer(args.socket, builder)
+    print(f"Listening for builds on '{args.socket}'...")
+    server.serve_until_shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import heapq
+import os
+import tempfile
+from datetime import datetime, timezone
+
+from htmlnode import escape_attr, escape_text
+from output import DIRECTORY, clamp_timestamp
+
+# https://www.sitemaps.org/protocol.html#index
+SITEMAP_MAX_URLS = 50000
+SITEMAP_NAME = "sitemap.xml"
+FEED_NAME = "atom.xml"
+FEED_ENTRIES = 20
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+ATOM_NS = "http://www.w3.org/2005/Atom"
+
+
+def timestamp(seconds):
+    date = datetime.fromtimestamp(seconds, timezone.utc).replace(microsecond=0)
+    return date.isoformat().replace("+00:00", "Z")
+
+
+def page_url(base_url, path):
+    # 'majesty/index.html' -> 'https://site/majesty/'
+    path = path.replace(os.sep, "/")
+    if path == "index.html" or path.endswith("/index.html"):
+        path = path.removesuffix("index.html")
+    return f"{base_url.rstrip('/')}/{path}"
+
+
+class SitemapWriter:
+    def __init__(self, dest_dir, base_url, max_urls=SITEMAP_MAX_URLS, output=None):
+        self.dest_dir = dest_dir
+        self.base_url = base_url
+        self.max_urls = max_urls
+        self.output = output if output is not None else DIRECTORY
+        self.files = []
+        self.chunks = 0
+        self.file = None
+        self.count = 0
+
+    def write(self, text):
+        self.file.write(text.encode())
+
+    def open_next(self):
+        if self.file is not None:
+            self.flush(f"sitemap-{self.chunks}.xml")
+        # NOTE: urls are spooled to disk, not kept in memory
+        self.chunks += 1
+        self.file = tempfile.TemporaryFile()
+        self.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self.write(f'<urlset xmlns="{SITEMAP_NS}">\n')
+        self.count = 0
+
+    def flush(self, name):
+        # Only once a chunk is complete do we know if it is the whole sitemap
+        self.write("</urlset>\n")
+        self.output.write_fileobj(self.file, os.path.join(self.dest_dir, name))
+        self.file.close()
+        self.file = None
+        self.files.append(name)
+
+    def add(self, url, updated):
+        if self.file is None or self.count == self.max_urls:
+            self.open_next()
+        self.write(
+            f"<url><loc>{escape_text(url)}</loc>"
+            f"<lastmod>{timestamp(updated)}</lastmod></url>\n"
+        )
+        self.count += 1
+
+    def close(self):
+        if self.file is None:
+            self.open_next()
+
+        # A single sitemap is served as is, more than one needs an index
+        if self.chunks == 1:
+            self.flush(SITEMAP_NAME)
+            return self.files
+
+        self.flush(f"sitemap-{self.chunks}.xml")
+        index = [
+            '<?xml version="1.0" encoding="UTF-8"?>\n',
+            f'<sitemapindex xmlns="{SITEMAP_NS}">\n',
+        ]
+        for name in self.files:
+            url = page_url(self.base_url, name)
+            index.append(f"<sitemap><loc>{escape_text(url)}</loc></sitemap>\n")
+        index.append("</sitemapindex>\n")
+        path = os.path.join(self.dest_dir, SITEMAP_NAME)
+        self.output.write_text(path, "".join(index))
+        self.files.append(SITEMAP_NAME)
+        return self.files
+
+
+class AtomWriter:
+    def __init__(self, dest_dir, base_url, max_entries=FEED_ENTRIES, output=None):
+        self.dest_dir = dest_dir
+        self.base_url = base_url
+        self.max_entries = max_entries
+        self.output = output if output is not None else DIRECTORY
+        self.title = base_url
+        # Min-heap of (updated, url, title), only the most recent are kept
+        self.entries = []
+
+    def add(self, url, title, updated):
+        if url == page_url(self.base_url, ""):
+            self.title = title
+
+        entry = (updated, url, title)
+        if len(self.entries) < self.max_entries:
+            heapq.heappush(self.entries, entry)
+        elif entry > self.entries[0]:
+            heapq.heapreplace(self.entries, entry)
+
+    def close(self):
+        entries = sorted(self.entries, reverse=True)
+        updated = timestamp(entries[0][0] if entries else 0)
+        home = page_url(self.base_url, "")
+
+        # NOTE: titles are html fragments, so escape them once more
+        feed = [
+            '<?xml version="1.0" encoding="utf-8"?>\n',
+            f'<feed xmlns="{ATOM_NS}">\n',
+            f'<title type="html">{escape_text(self.title)}</title>\n',
+            f"<id>{escape_text(home)}</id>\n",
+            f'<link href="{escape_attr(home)}"/>\n',
+            f"<updated>{updated}</updated>\n",
+            f"<author><name>{escape_text(home)}</name></author>\n",
+        ]
+        for seconds, url, title in entries:
+            feed.append(
+                f'<entry><title type="html">{escape_text(title)}</title>'
+                f'<link href="{escape_attr(url)}"/><id>{escape_text(url)}</id>'
+                f"<updated>{timestamp(seconds)}</updated></entry>\n"
+            )
+        feed.append("</feed>\n")
+        self.output.write_text(os.path.join(self.dest_dir, FEED_NAME), "".join(feed))
+        return [FEED_NAME]
+
+
+class SiteFeeds:
+    def __init__(self, dest_dir, base_url, output=None):
+        self.dest_dir = dest_dir
+        self.base_url = base_url
+        self.sitemap = SitemapWriter(dest_dir, base_url, output=output)
+        self.atom = AtomWriter(dest_dir, base_url, output=output)
+
+    def add_page(self, path, title, updated):
+        updated = clamp_timestamp(updated)
+        path = os.path.relpath(path, self.dest_dir)
+        url = page_url(self.base_url, path)
+        self.sitemap.add(url, updated)
+        self.atom.add(url, title, updated)
+
+    def close(self):
+        return self.sitemap.close() + self.atom.close()
@@ -0,0 +1,107 @@
+import functools
+import re
+
+NUMBER = r"\b(?:0[xX][0-9a-fA-F]+|\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)\b"
+DOUBLE_QUOTED = r'"(?:\\.|[^"\\\n])*"'
+SINGLE_QUOTED = r"'(?:\\.|[^'\\\n])*'"
+
+# Each language maps token types to patterns, tried in this order at every
+# position. Keywords are plain word lists.
+LANGUAGES = {
+    "python": {
+        "comment": r"#[^\n]*",
+        "string": "|".join(
+            [r'"""[\s\S]*?"""', r"\'\'\'[\s\S]*?\'\'\'", DOUBLE_QUOTED, SINGLE_QUOTED]
+        ),
+        "number": NUMBER,
+        "keyword": """
+            False None True and as assert async await break class continue def
+            del elif else except finally for from global if import in is lambda
+            nonlocal not or pass raise return try while with yield
+        """,
+        "builtin": """
+            abs all any bool dict enumerate filter float int isinstance len list
+            map max min open print range repr set sorted str sum super tuple type
+            zip
+        """,
+    },
+    "javascript": {
+        "comment": r"//[^\n]*|/\*[\s\S]*?\*/",
+        "string": rf"`(?:\\.|[^`\\])*`|{DOUBLE_QUOTED}|{SINGLE_QUOTED}",
+        "number": NUMBER,
+        "keyword": """
+            async await break case catch class const continue default delete do
+            else export extends false finally for function if import in
+            instanceof let new null return super switch this throw true try
+            typeof undefined var void while yield
+        """,
+        "builtin": "Array Date JSON Math Number Object Promise String console",
+    },
+    "bash": {
+        "comment": r"(?<![\w$])#[^\n]*",
+        "string": r'"(?:\\.|[^"\\])*"|\'[^\']*\'',
+        "variable": r"\$(?:\{[^}\n]*\}|\w+|[@#?$!*0-9])",
+        "keyword": """
+            case do done elif else esac fi for function if in local return
+            select then until while
+        """,
+        "builtin": "cd echo exit export printf read set shift source test unset",
+    },
+    "json": {
+        "string": DOUBLE_QUOTED,
+        "number": r"-?" + NUMBER,
+        "keyword": "false null true",
+    },
+}
+
+ALIASES = {
+    "py": "python",
+    "python3": "python",
+    "js": "javascript",
+    "sh": "bash",
+    "shell": "bash",
+    "console": "bash",
+}
+
+WORD_TYPES = ("keyword", "builtin")
+
+
+def normalize_language(language):
+    language = language.strip().lower()
+    return ALIASES.get(language, language)
+
+
+@functools.lru_cache(maxsize=None)
+def lexer(language):
+    rules = LANGUAGES.get(language)
+    if rules is None:
+        return None
+
+    patterns = []
+    for token_type, pattern in rules.items():
+        if token_type in WORD_TYPES:
+            words = "|".join(re.escape(word) for word in pattern.split())
+            pattern = rf"\b(?:{words})\b"
+        patterns.append(f"(?P<{token_type}>{pattern})")
+    return re.compile("|".join(patterns))
+
+
+@functools.lru_cache(maxsize=1024)
+def highlight(language, code):
+    # Returns (token_type, text) pairs, token_type is None for plain text
+    regex = lexer(normalize_language(language))
+    if regex is None:
+        return ((None, code),) if code else ()
+
+    tokens = []
+    position = 0
+    for match in regex.finditer(code):
+        start, end = match.span()
+        if start > position:
+            tokens.append((None, code[position:start]))
+        tokens.append((match.lastgroup, match.group()))
+        position = end
+
+    if position < len(code):
+        tokens.append((None, code[position:]))
+    return tuple(tokens)
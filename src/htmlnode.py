@@ -1,3 +1,31 @@
+import functools
+import re
+
+# Tags whose text content must be emitted verbatim when minifying
+PRESERVE_WHITESPACE = {"pre", "code", "textarea", "script", "style"}
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def collapse_whitespace(text):
+    return WHITESPACE.sub(" ", text)
+
+
+def escape_text(text):
+    # Most text has nothing to escape, so avoid building new strings
+    if "&" in text or "<" in text or ">" in text:
+        text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+
+@functools.lru_cache(maxsize=4096)
+def escape_attr(value):
+    # NOTE: cached since the same urls and classes repeat across nodes and pages
+    if "&" in value or "<" in value or ">" in value or '"' in value:
+        value = escape_text(value).replace('"', "&quot;")
+    return value
+
+
 class HTMLNode:
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
@@ -5,12 +33,18 @@ class HTMLNode:
         self.children = children
         self.props = props
 
-    def to_html(self):
+    def to_html(self, minify=False):
         raise NotImplementedError
 
+    def write_html(self, parts, minify=False):
+        parts.append(self.to_html(minify))
+
     def props_to_html(self):
         if self.props is not None:
-            joined = [f' {key}="{value}"' for key, value in self.props.items()]
+            joined = [
+                f' {key}="{escape_attr(str(value))}"'
+                for key, value in self.props.items()
+            ]
             return "".join(joined)
         return ""
 
@@ -30,12 +64,17 @@ class LeafNode(HTMLNode):
         super().__init__(tag, value, None, props)
         pass
 
-    def to_html(self):
+    def to_html(self, minify=False):
         if self.value is None:
             raise ValueError("'value' field is required")
+
+        value = self.value
+        if minify and self.tag not in PRESERVE_WHITESPACE:
+            value = collapse_whitespace(value)
+        value = escape_text(value)
         if self.tag is None:
-            return self.value
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+            return value
+        return f"<{self.tag}{self.props_to_html()}>{value}</{self.tag}>"
 
     def __repr__(self) -> str:
         return f"Leaf({self.tag}, {self.value}, {self.props})"
@@ -46,15 +85,24 @@ class ParentNode(HTMLNode):
         super().__init__(tag, None, children, props)
         pass
 
-    def to_html(self):
+    def to_html(self, minify=False):
+        parts = []
+        self.write_html(parts, minify)
+        return "".join(parts)
+
+    def write_html(self, parts, minify=False):
+        # NOTE: children append to a shared list, returning strings would
+        # copy the whole subtree again at every level of nesting
         if self.children is None:
             raise ValueError("'children' field is required")
         if self.tag is None:
             raise ValueError("'tag' field is required")
-        result = f"<{self.tag}{self.props_to_html()}>"
+        if self.tag in PRESERVE_WHITESPACE:
+            minify = False
+        parts.append(f"<{self.tag}{self.props_to_html()}>")
         for child in self.children:
-            result += child.to_html()
-        return result + f"</{self.tag}>"
+            child.write_html(parts, minify)
+        parts.append(f"</{self.tag}>")
 
     def __repr__(self) -> str:
         return f"Parent({self.tag}, {self.children}, {self.props})"
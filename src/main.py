@@ -1,25 +1,38 @@
+import argparse
 import os
-import shutil
 
+from assets import AssetInliner
+from feeds import SiteFeeds
 from markdown import markdown_to_html_node
+from output import DIRECTORY, is_archive, open_output
+from shard import Manifest, Shard, merge_shards, parse_shard, write_shard_manifest
+from template import load_template
 
 
-def copy_to_dir(src, dest):
-    if os.path.exists(dest):
-        shutil.rmtree(dest)
-    os.mkdir(dest)
+def copy_to_dir(src, dest, shard=None, manifest=None, output=None):
+    if output is None:
+        output = DIRECTORY
+    output.make_dir(dest, clean=True)
 
     if os.path.isfile(src):
-        shutil.copy(src, dest)
+        if shard is None or shard.owns(src):
+            dest_path = os.path.join(dest, os.path.basename(src))
+            output.copy_file(src, dest_path)
+            if manifest is not None:
+                manifest.add_output(dest_path, src)
         return
 
-    for path in os.listdir(src):
+    for path in sorted(os.listdir(src)):
         src_path = os.path.join(src, path)
-        print(f"Copying '{src_path}' to '{dest}'")
         if os.path.isfile(src_path):
-            shutil.copy(src_path, dest)
+            if shard is not None and not shard.owns(src_path):
+                continue
+            print(f"Copying '{src_path}' to '{dest}'")
+            output.copy_file(src_path, os.path.join(dest, path))
+            if manifest is not None:
+                manifest.add_output(os.path.join(dest, path), src_path)
         else:
-            copy_to_dir(src_path, os.path.join(dest, path))
+            copy_to_dir(src_path, os.path.join(dest, path), shard, manifest, output)
 
 
 def read_file(path):
@@ -27,11 +40,6 @@ def read_file(path):
         return file.read()
 
 
-def write_file(text, path):
-    with open(path, "w") as file:
-        file.write(text)
-
-
 def extract_title(html):
     try:
         _, title = html.split("<h1>", maxsplit=1)
@@ -42,38 +50,200 @@ def extract_title(html):
     return title
 
 
-def generate_page(from_path, template_path, dest_path):
-    print(f"Generating page '{from_path}' to '{dest_path}' using '{template_path}'")
-    markdown = read_file(from_path)
-    template = read_file(template_path)
-    html = markdown_to_html_node(markdown)
-    html = html.to_html()
-    title = extract_title(html)
+def extract_links(node):
+    if node.tag == "a":
+        return [node.props["href"]]
 
-    html = template.replace("{{ Content }}", html)
-    html = html.replace("{{ Title }}", title)
-    write_file(html, dest_path)
+    links = []
+    for child in node.children or []:
+        links.extend(extract_links(child))
+    return links
 
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path):
-    if not os.path.exists(dest_dir_path):
-        os.mkdir(dest_dir_path)
+def render_page(markdown, template, minify=False, assets=None):
+    node = markdown_to_html_node(markdown)
+    if assets is not None:
+        assets.inline_images(node)
+    html = node.to_html(minify)
+    title = extract_title(html)
 
-    for dir in os.listdir(dir_path_content):
+    html = template.render(Content=html, Title=title)
+    return html, title, extract_links(node)
+
+
+def generate_page(
+    from_path, template_path, dest_path, minify=False, assets=None, output=None
+):
+    print(f"Generating page '{from_path}' to '{dest_path}' using '{template_path}'")
+    markdown = read_file(from_path)
+    template = load_template(template_path, minify, assets)
+    html, title, links = render_page(markdown, template, minify, assets)
+    if output is None:
+        output = DIRECTORY
+    output.write_text(dest_path, html)
+    return title, links
+
+
+def generate_pages_recursive(
+    dir_path_content,
+    template_path,
+    dest_dir_path,
+    shard=None,
+    manifest=None,
+    minify=False,
+    assets=None,
+    output=None,
+):
+    if output is None:
+        output = DIRECTORY
+    output.make_dir(dest_dir_path)
+
+    for dir in sorted(os.listdir(dir_path_content)):
         path = os.path.join(dir_path_content, dir)
         if os.path.isfile(path):
             name, ext = os.path.splitext(dir)
-            if ext == ".md":
-                dest = os.path.join(dest_dir_path, f"{name}.html")
-                generate_page(path, template_path, dest)
+            if ext != ".md":
+                continue
+            if shard is not None and not shard.owns(path):
+                continue
+            dest = os.path.join(dest_dir_path, f"{name}.html")
+            title, links = generate_page(
+                path, template_path, dest, minify, assets, output
+            )
+            if manifest is not None:
+                updated = os.path.getmtime(path)
+                manifest.add_page(dest, path, title, links, updated)
         else:
             dest = os.path.join(dest_dir_path, dir)
-            generate_pages_recursive(path, template_path, dest)
+            generate_pages_recursive(
+                path,
+                template_path,
+                dest,
+                shard,
+                manifest,
+                minify,
+                assets,
+                output,
+            )
+
+
+def page_order(path):
+    # The order pages are generated in, 'a/index.html' comes before 'a-b.html'
+    return path.split("/")
+
+
+def close_feeds(feeds, manifest):
+    for name in feeds.close():
+        manifest.add_output(os.path.join(feeds.dest_dir, name), None)
+
+
+def build(dest, shard=None, minify=False, base_url=None, assets=None):
+    # `dest` is either a directory or a .tar, .tar.gz, .tgz or .zip archive
+    manifest = Manifest(dest, shard=shard)
+    output = open_output(dest)
+    try:
+        copy_to_dir("static", dest, shard, manifest, output)
+        generate_pages_recursive(
+            "content",
+            "template.html",
+            dest,
+            shard,
+            manifest,
+            minify,
+            assets,
+            output,
+        )
+
+        # NOTE: sharded builds only get feeds once merged
+        if shard is None:
+            write_feeds(manifest, dest, base_url, output)
+    finally:
+        output.close()
+    return manifest
+
+
+def write_feeds(manifest, dest, base_url, output=None):
+    # Full, merged and daemon builds all list pages in the same order
+    feeds = SiteFeeds(dest, base_url, output)
+    for path in sorted(manifest.pages, key=page_order):
+        page = manifest.pages[path]
+        feeds.add_page(os.path.join(dest, path), page["title"], page["updated"])
+    close_feeds(feeds, manifest)
+
+
+def merge(shard_dirs, dest, base_url):
+    manifest = Manifest(dest)
+    output = open_output(dest)
+    try:
+        merged = merge_shards(shard_dirs, dest, output)
+        manifest.outputs, manifest.pages = merged.outputs, merged.pages
+        write_feeds(manifest, dest, base_url, output)
+    finally:
+        output.close()
+    return manifest
+
+
+def add_inline_arguments(parser):
+    parser.add_argument(
+        "--inline-css-limit",
+        type=int,
+        help="Inline stylesheets up to this many bytes into the page <head>",
+        default=0,
+    )
+    parser.add_argument(
+        "--inline-image-limit",
+        type=int,
+        help="Embed images up to this many bytes as data uris",
+        default=0,
+    )
+
+
+def inline_assets(args):
+    if args.inline_css_limit <= 0 and args.inline_image_limit <= 0:
+        return None
+    return AssetInliner("static", args.inline_css_limit, args.inline_image_limit)
 
 
 def main():
-    copy_to_dir("static", "public")
-    generate_pages_recursive("content", "template.html", "public")
+    parser = argparse.ArgumentParser(description="Static site generator")
+    parser.add_argument("--out", type=str, help="Output directory", default="public")
+    parser.add_argument(
+        "--shard", type=str, help="Only build the i-th of N partitions, as 'i/N'"
+    )
+    parser.add_argument(
+        "--merge", type=str, nargs="+", help="Merge shard output directories"
+    )
+    parser.add_argument("--manifest", type=str, help="Where to write the manifest")
+    parser.add_argument(
+        "--minify", action="store_true", help="Strip insignificant whitespace"
+    )
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        help="Site url used in sitemap.xml and atom.xml",
+        default="http://localhost:8888",
+    )
+    add_inline_arguments(parser)
+    args = parser.parse_args()
+    assets = inline_assets(args)
+
+    if args.merge:
+        manifest = merge(args.merge, args.out, args.base_url)
+        if args.manifest:
+            manifest.write(args.manifest)
+        return
+
+    if args.shard:
+        if is_archive(args.out):
+            parser.error("--shard needs a directory --out, archive the merge")
+        shard = Shard(*parse_shard(args.shard))
+        manifest = build(args.out, shard, args.minify, args.base_url, assets)
+        write_shard_manifest(manifest, args.out)
+        return
+
+    manifest = build(args.out, None, args.minify, args.base_url, assets)
+    if args.manifest:
+        manifest.write(args.manifest)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 import enum
 import re
 
+from highlight import highlight
 from htmlnode import LeafNode, ParentNode
 from textnode import TextNode, TextType
 
@@ -15,17 +16,21 @@ class Block(enum.Enum):
 
 
 ## Markdown inline
+# ![alt](src)
+IMAGE_PATTERN = re.compile(r"!\[(.*?)\]\((.*?)\)")
+# [alt](url)
+LINK_PATTERN = re.compile(r"\[(.*?)\]\((.*?)\)")
+
+
 def extract_markdown_images(text):
-    # ![alt](src)
-    return re.findall(r"!\[(.*?)\]\((.*?)\)", text)
+    return IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text):
-    # [alt](url)
-    return re.findall(r"\[(.*?)\]\((.*?)\)", text)
+    return LINK_PATTERN.findall(text)
 
 
-def split_nodes_image(old_nodes):
+def split_nodes_pattern(old_nodes, pattern, text_type):
     new_nodes = []
     for node in old_nodes:
         if node.text_type != TextType.Text:
@@ -33,46 +38,31 @@ def split_nodes_image(old_nodes):
             new_nodes.append(node)
             continue
 
-        matches = extract_markdown_images(node.text)
-        if not matches:
-            new_nodes.append(node)
-            continue
-
+        # NOTE: slice by match position, re-splitting the remaining text
+        # for every match is quadratic in the number of matches
         text = node.text
-        for alt, url in matches:
-            start, text = text.split(f"![{alt}]({url})", maxsplit=1)
-            if start != "":
-                new_nodes.append(TextNode(start, TextType.Text))
-            new_nodes.append(TextNode(alt, TextType.Image, url))
-
-        if text != "":
-            new_nodes.append(TextNode(text, TextType.Text))
+        position = 0
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            if start > position:
+                new_nodes.append(TextNode(text[position:start], TextType.Text))
+            alt, url = match.groups()
+            new_nodes.append(TextNode(alt, text_type, url))
+            position = end
+
+        if position == 0:
+            new_nodes.append(node)
+        elif position < len(text):
+            new_nodes.append(TextNode(text[position:], TextType.Text))
     return new_nodes
 
 
-def split_nodes_link(old_nodes):
-    new_nodes = []
-    for node in old_nodes:
-        if node.text_type != TextType.Text:
-            # warn: we only split Text
-            new_nodes.append(node)
-            continue
+def split_nodes_image(old_nodes):
+    return split_nodes_pattern(old_nodes, IMAGE_PATTERN, TextType.Image)
 
-        matches = extract_markdown_links(node.text)
-        if not matches:
-            new_nodes.append(node)
-            continue
 
-        text = node.text
-        for alt, url in matches:
-            start, text = text.split(f"[{alt}]({url})", maxsplit=1)
-            if start != "":
-                new_nodes.append(TextNode(start, TextType.Text))
-            new_nodes.append(TextNode(alt, TextType.Link, url))
-
-        if text != "":
-            new_nodes.append(TextNode(text, TextType.Text))
-    return new_nodes
+def split_nodes_link(old_nodes):
+    return split_nodes_pattern(old_nodes, LINK_PATTERN, TextType.Link)
 
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
@@ -139,15 +129,56 @@ def text_node_to_html_node(text_node):
 
 
 ## Markdown blocks
+# ``` or ```lang, nothing else on the line
+FENCE_OPEN = re.compile(r"```[\w+-]*")
+
+
+def is_fence_open(line):
+    return FENCE_OPEN.fullmatch(line.strip()) is not None
+
+
+def is_fence_close(line):
+    return line.strip() == "```"
+
+
+def ends_fence(block):
+    return any(is_fence_close(line) for line in block.split("\n"))
+
+
+def is_open_fence(block):
+    # Closed within the block, even with text after the closing fence
+    lines = block.split("\n")
+    return is_fence_open(lines[0]) and not ends_fence("\n".join(lines[1:]))
+
+
 def markdown_to_blocks(markdown: str):
     # NOTE: we assume blocks are separated by blank lines!
     lines = markdown.split("\n\n")
 
     blocks = []
-    for line in lines:
+    # Once a fence runs off the end, no later fence can be closed either
+    unclosed = False
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        i += 1
         if line == "":
             continue
-        blocks.append(line.strip())
+        if unclosed or not is_open_fence(line.strip()):
+            blocks.append(line.strip())
+            continue
+
+        # Blank lines inside a code fence belong to the code
+        end = i
+        while end < len(lines) and not ends_fence(lines[end]):
+            end += 1
+        if end == len(lines):
+            # Never closed, so not a fence after all
+            unclosed = True
+            blocks.append(line.strip())
+            continue
+        blocks.append("\n\n".join(lines[i - 1 : end + 1]).strip())
+        i = end + 1
     return blocks
 
 
@@ -157,7 +188,7 @@ def block_to_block_type(block):
 
     if any([lines[0].startswith(h) for h in allowed_headings]):
         return Block.Heading
-    if len(lines) > 1 and lines[0] == "```" and lines[-1] == "```":
+    if len(lines) > 1 and is_fence_open(lines[0]) and is_fence_close(lines[-1]):
         return Block.Code
     if all([line.startswith(">") for line in lines]):
         return Block.Quote
@@ -191,11 +222,23 @@ def heading_block_to_html(block):
 
 
 def code_block_to_html(block):
+    # NOTE: code is kept verbatim, no inline markdown parsing
     lines = block.split("\n")
+    language = lines[0].removeprefix("```").strip()
     text = "\n".join(lines[1:-1])
-    nodes = text_to_textnodes(text)
-    children = [text_node_to_html_node(node) for node in nodes]
-    return ParentNode(tag="pre", children=[ParentNode(tag="code", children=children)])
+
+    children = []
+    for token_type, token in highlight(language, text):
+        if token_type is None:
+            children.append(LeafNode(value=token))
+        else:
+            children.append(
+                LeafNode(tag="span", value=token, props={"class": f"tok-{token_type}"})
+            )
+
+    props = {"class": f"language-{language}"} if language else None
+    code = ParentNode(tag="code", children=children, props=props)
+    return ParentNode(tag="pre", children=[code])
 
 
 def quote_block_to_html(block):
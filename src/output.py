@@ -0,0 +1,152 @@
+import gzip
+import io
+import os
+import shutil
+import tarfile
+import time
+import zipfile
+
+# Timestamp of every archive member, so that builds are reproducible.
+# Defaults to 1980-01-01, the earliest date zip can store.
+# https://reproducible-builds.org/specs/source-date-epoch/
+DEFAULT_EPOCH = 315532800
+FILE_MODE = 0o644
+
+
+def source_date_epoch():
+    return max(int(os.environ.get("SOURCE_DATE_EPOCH", DEFAULT_EPOCH)), DEFAULT_EPOCH)
+
+
+def clamp_timestamp(seconds):
+    # Source mtimes change with every checkout or edit, so timestamps that
+    # end up in the output are never later than SOURCE_DATE_EPOCH when set
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch is None:
+        return seconds
+    return min(seconds, int(epoch))
+
+
+class DirectoryOutput:
+    def make_dir(self, path, clean=False):
+        if clean and os.path.exists(path):
+            shutil.rmtree(path)
+        os.makedirs(path, exist_ok=True)
+
+    def write_text(self, path, text):
+        with open(path, "w") as file:
+            file.write(text)
+
+    def copy_file(self, src, path):
+        shutil.copy(src, path)
+
+    def write_fileobj(self, fileobj, path):
+        # NOTE: always copies from the start of `fileobj`
+        fileobj.seek(0)
+        with open(path, "wb") as file:
+            shutil.copyfileobj(fileobj, file)
+
+    def remove(self, path):
+        # NOTE: only directories can be updated in place, archives are rewritten
+        if os.path.exists(path):
+            os.remove(path)
+
+    def close(self):
+        pass
+
+
+class ArchiveOutput:
+    # Members are named relative to the archive path, which stands in for
+    # the output directory, and added in the order they are generated
+    def __init__(self, path):
+        self.path = path
+        self.epoch = source_date_epoch()
+        self.names = set()
+
+    def member_name(self, path):
+        name = os.path.relpath(path, self.path).replace(os.sep, "/")
+        if name.startswith("../"):
+            raise Exception(f"'{path}' is outside of '{self.path}'")
+        if name in self.names:
+            raise Exception(f"'{name}' was already written to '{self.path}'")
+        self.names.add(name)
+        return name
+
+    def make_dir(self, path, clean=False):
+        # NOTE: archives have no directory entries, files carry their path
+        pass
+
+    def write_text(self, path, text):
+        data = text.encode()
+        self.add(self.member_name(path), io.BytesIO(data), len(data))
+
+    def copy_file(self, src, path):
+        with open(src, "rb") as file:
+            self.add(self.member_name(path), file, os.fstat(file.fileno()).st_size)
+
+    def write_fileobj(self, fileobj, path):
+        size = fileobj.seek(0, io.SEEK_END) - fileobj.seek(0)
+        self.add(self.member_name(path), fileobj, size)
+
+
+class TarOutput(ArchiveOutput):
+    def __init__(self, path, compress=False):
+        super().__init__(path)
+        self.file = open(self.path, "wb")
+        self.gzip = None
+        fileobj = self.file
+        if compress:
+            # NOTE: tarfile's own gzip mode stores the current time
+            self.gzip = gzip.GzipFile(
+                filename="", mode="wb", fileobj=self.file, mtime=self.epoch
+            )
+            fileobj = self.gzip
+        self.tar = tarfile.open(fileobj=fileobj, mode="w", format=tarfile.PAX_FORMAT)
+
+    def add(self, name, fileobj, size):
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = self.epoch
+        info.mode = FILE_MODE
+        self.tar.addfile(info, fileobj)
+
+    def close(self):
+        self.tar.close()
+        if self.gzip is not None:
+            self.gzip.close()
+        self.file.close()
+
+
+class ZipOutput(ArchiveOutput):
+    def __init__(self, path):
+        super().__init__(path)
+        self.zip = zipfile.ZipFile(self.path, "w", zipfile.ZIP_DEFLATED)
+        self.date_time = time.gmtime(self.epoch)[:6]
+
+    def add(self, name, fileobj, size):
+        info = zipfile.ZipInfo(name, self.date_time)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = (0o100000 | FILE_MODE) << 16
+        info.file_size = size
+        with self.zip.open(info, "w") as file:
+            shutil.copyfileobj(fileobj, file)
+
+    def close(self):
+        self.zip.close()
+
+
+def is_archive(path):
+    return path.endswith((".tar", ".tar.gz", ".tgz", ".zip"))
+
+
+def open_output(path):
+    # The output kind follows the extension of `path`
+    if path.endswith(".tar"):
+        return TarOutput(path)
+    if path.endswith((".tar.gz", ".tgz")):
+        return TarOutput(path, compress=True)
+    if path.endswith(".zip"):
+        return ZipOutput(path)
+    return DirectoryOutput()
+
+
+DIRECTORY = DirectoryOutput()
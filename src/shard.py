@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+
+from output import DIRECTORY
+
+# NOTE: must not clash with site files, 'manifest.json' is a web app manifest
+MANIFEST_NAME = ".shard-manifest.json"
+
+
+def parse_shard(spec):
+    # i/N, with 0 <= i < N
+    try:
+        index, count = spec.split("/", maxsplit=1)
+        index, count = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}', expected 'i/N'")
+
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{spec}', expected 0 <= i < N")
+    return index, count
+
+
+def shard_of(path, count):
+    # NOTE: `hash()` is salted per process, so we need a stable digest
+    key = os.path.normpath(path).replace(os.sep, "/")
+    digest = hashlib.sha1(key.encode()).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+class Shard:
+    def __init__(self, index, count):
+        self.index = index
+        self.count = count
+
+    def owns(self, path):
+        return shard_of(path, self.count) == self.index
+
+    def __repr__(self) -> str:
+        return f"Shard({self.index}/{self.count})"
+
+
+class Manifest:
+    def __init__(self, root=None, outputs=None, pages=None, shard=None):
+        self.root = root
+        self.outputs = outputs if outputs is not None else {}
+        self.pages = pages if pages is not None else {}
+        # The partition these outputs are, None for a whole site
+        self.shard = shard
+
+    def relpath(self, path):
+        if self.root is None:
+            return path
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def add_output(self, path, source):
+        self.outputs[self.relpath(path)] = source
+
+    def add_page(self, path, source, title, links, updated):
+        # `updated` is recorded, merging must not need the sources
+        path = self.relpath(path)
+        self.outputs[path] = source
+        self.pages[path] = {"title": title, "links": links, "updated": updated}
+
+    def remove(self, path):
+        path = self.relpath(path)
+        self.outputs.pop(path, None)
+        self.pages.pop(path, None)
+
+    def to_dict(self):
+        data = {"outputs": self.outputs, "pages": self.pages}
+        if self.shard is not None:
+            data["shard"] = {"index": self.shard.index, "count": self.shard.count}
+        return data
+
+    def write(self, path):
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2, sort_keys=True)
+
+    @classmethod
+    def read(cls, path):
+        with open(path, "r") as file:
+            data = json.load(file)
+        shard = Shard(**data["shard"]) if "shard" in data else None
+        return cls(outputs=data["outputs"], pages=data["pages"], shard=shard)
+
+    def __eq__(self, other) -> bool:
+        return self.outputs == other.outputs and self.pages == other.pages
+
+    def __repr__(self) -> str:
+        return f"Manifest({self.outputs}, {self.pages})"
+
+
+def write_shard_manifest(manifest, shard_dir):
+    if manifest.shard is None:
+        raise Exception(f"'{shard_dir}' is not a shard, nothing to merge it with")
+    if MANIFEST_NAME in manifest.outputs:
+        source = manifest.outputs[MANIFEST_NAME]
+        raise Exception(f"'{source}' collides with the shard manifest name")
+    manifest.write(os.path.join(shard_dir, MANIFEST_NAME))
+
+
+def list_files(root):
+    files = []
+    for dir, _, names in os.walk(root):
+        for name in names:
+            path = os.path.relpath(os.path.join(dir, name), root)
+            files.append(path.replace(os.sep, "/"))
+    return sorted(files)
+
+
+def check_shards(shards):
+    # shard_dir -> Shard, every i of the same N must be there exactly once
+    counts = {shard.count for shard in shards.values()}
+    if not counts:
+        raise Exception("No shards to merge")
+    if len(counts) > 1:
+        raise Exception(f"Shards were built with different counts {sorted(counts)}")
+
+    count = counts.pop()
+    indices = {}
+    for shard_dir, shard in shards.items():
+        if shard.index in indices:
+            raise Exception(
+                f"Shard {shard.index}/{count} is both "
+                f"'{indices[shard.index]}' and '{shard_dir}'"
+            )
+        indices[shard.index] = shard_dir
+
+    missing = sorted(set(range(count)) - set(indices))
+    if missing:
+        missing = ", ".join(f"{index}/{count}" for index in missing)
+        raise Exception(f"Missing shards {missing}")
+
+
+def merge_shards(shard_dirs, dest, output=None):
+    merged = Manifest()
+    owners = {}
+    shards = {}
+
+    # Verify everything before touching `dest`
+    for shard_dir in shard_dirs:
+        manifest = Manifest.read(os.path.join(shard_dir, MANIFEST_NAME))
+        if manifest.shard is None:
+            raise Exception(f"Shard '{shard_dir}' does not say which shard it is")
+        shards[shard_dir] = manifest.shard
+        files = [f for f in list_files(shard_dir) if f != MANIFEST_NAME]
+
+        missing = set(manifest.outputs) - set(files)
+        if missing:
+            raise Exception(f"Shard '{shard_dir}' is missing {sorted(missing)}")
+
+        for path in files:
+            if path not in manifest.outputs:
+                raise Exception(f"Shard '{shard_dir}' has unlisted '{path}'")
+            if path in owners:
+                raise Exception(
+                    f"Output '{path}' produced by both '{owners[path]}' and '{shard_dir}'"
+                )
+            owners[path] = shard_dir
+
+        merged.outputs.update(manifest.outputs)
+        merged.pages.update(manifest.pages)
+    check_shards(shards)
+
+    if output is None:
+        output = DIRECTORY
+    output.make_dir(dest, clean=True)
+
+    for path, shard_dir in sorted(owners.items()):
+        print(f"Merging '{path}' from '{shard_dir}'")
+        dest_path = os.path.join(dest, path)
+        output.make_dir(os.path.dirname(dest_path))
+        output.copy_file(os.path.join(shard_dir, path), dest_path)
+    return merged
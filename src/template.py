@@ -0,0 +1,119 @@
+import itertools
+import re
+
+from assets import file_key
+from htmlnode import PRESERVE_WHITESPACE, collapse_whitespace
+
+# {{ Name }}
+PLACEHOLDER = re.compile(r"{{\s*(\w+)\s*}}")
+
+COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+TAG = re.compile(r"(<[^>]*>)")
+TAG_NAME = re.compile(r"</?([a-zA-Z][a-zA-Z0-9]*)")
+
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "body", "div", "dl", "dd",
+    "dt", "fieldset", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+    "h5", "h6", "head", "header", "hr", "html", "li", "link", "main", "meta",
+    "nav", "ol", "p", "pre", "section", "table", "tbody", "td", "tfoot",
+    "th", "thead", "title", "tr", "ul", "!doctype",
+}  # fmt: skip
+
+
+def tag_name(token):
+    if token.startswith("<!"):
+        return token[1:].split()[0].rstrip(">").lower()
+    match = TAG_NAME.match(token)
+    return match.group(1).lower() if match else None
+
+
+def minify_html(html):
+    # Tags at odd indices, the text between them at even ones
+    tokens = TAG.split(COMMENT.sub("", html))
+    result = []
+    preserve = 0
+
+    for i, token in enumerate(tokens):
+        if i % 2 == 1:
+            name = tag_name(token)
+            if name in PRESERVE_WHITESPACE:
+                preserve += -1 if token.startswith("</") else 1
+            result.append(token)
+            continue
+
+        if preserve > 0 or token == "":
+            result.append(token)
+            continue
+
+        # NOTE: whitespace next to a block tag is never rendered
+        text = collapse_whitespace(token)
+        if i == 0 or tag_name(tokens[i - 1]) in BLOCK_TAGS:
+            text = text.lstrip()
+        if i == len(tokens) - 1 or tag_name(tokens[i + 1]) in BLOCK_TAGS:
+            text = text.rstrip()
+        result.append(text)
+    return "".join(result)
+
+
+# NOTE: unlike `id()`, a version is never reused once a template is freed
+TEMPLATE_VERSIONS = itertools.count()
+
+
+class Template:
+    def __init__(self, text, minify=False, assets=None):
+        self.version = next(TEMPLATE_VERSIONS)
+        if minify:
+            text = minify_html(text)
+        # Literals at even indices, placeholder names at odd ones
+        self.parts = PLACEHOLDER.split(text)
+        self.dependencies = []
+
+        # NOTE: inlined into the literals, so pages still render in a single
+        # substitution pass and a `{{ }}` in the css is never substituted
+        if assets is not None:
+            for i in range(0, len(self.parts), 2):
+                self.parts[i], dependencies = assets.inline_html(self.parts[i])
+                self.dependencies.extend(dependencies)
+
+    @classmethod
+    def from_file(cls, path, minify=False, assets=None):
+        with open(path, "r") as file:
+            return cls(file.read(), minify, assets)
+
+    def placeholders(self):
+        return self.parts[1::2]
+
+    def render(self, **values):
+        parts = self.parts.copy()
+        for i in range(1, len(parts), 2):
+            try:
+                parts[i] = values[parts[i]]
+            except KeyError:
+                raise Exception(f"Missing value for placeholder '{parts[i]}'")
+        return "".join(parts)
+
+
+# (path, minify, assets) -> (key, Template)
+TEMPLATE_CACHE = {}
+
+
+def files_key(paths):
+    try:
+        return tuple(file_key(path) for path in paths)
+    except FileNotFoundError:
+        return None
+
+
+def load_template(path, minify=False, assets=None):
+    # NOTE: templates are parsed once per build, or once per change of the
+    # template or of an inlined asset when running as a daemon
+    cached = TEMPLATE_CACHE.get((path, minify, assets))
+    if cached is not None:
+        key, template = cached
+        if key == files_key([path, *template.dependencies]):
+            return template
+
+    template = Template.from_file(path, minify, assets)
+    key = files_key([path, *template.dependencies])
+    TEMPLATE_CACHE[(path, minify, assets)] = (key, template)
+    return template
@@ -0,0 +1,159 @@
+import os
+import tempfile
+import unittest
+
+from assets import AssetInliner
+from htmlnode import LeafNode, ParentNode
+from template import Template, load_template
+
+# 1x1 transparent gif
+GIF = (
+    b"GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01"
+    b"\x00\x00\x00\x00,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;"
+)
+GIF_URI = (
+    "data:image/gif;base64,"
+    "R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAICRAEAOw=="
+)
+
+
+class AssetInlinerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = self.tmp.name
+        self.write("css/site.css", "a { background: url(../images/dot.gif) }")
+        self.write("images/dot.gif", GIF)
+        self.write("images/big.gif", GIF * 10)
+        self.assets = AssetInliner(self.static, css_limit=1024, image_limit=64)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.static, *name.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb" if isinstance(data, bytes) else "w") as file:
+            file.write(data)
+        return path
+
+    def test_data_uri(self):
+        self.assertEqual(self.assets.data_uri("/images/dot.gif"), GIF_URI)
+        self.assertIsNone(self.assets.data_uri("/images/big.gif"))
+        self.assertIsNone(self.assets.data_uri("/images/missing.gif"))
+        self.assertIsNone(self.assets.data_uri("https://example.com/dot.gif"))
+
+    def test_inline_stylesheet(self):
+        html = '<head><link rel="stylesheet" href="/css/site.css"></head>'
+        html, dependencies = self.assets.inline_html(html)
+        expected = f'<head><style>a {{ background: url("{GIF_URI}") }}</style></head>'
+        self.assertEqual(html, expected)
+        self.assertEqual(
+            dependencies,
+            [
+                os.path.join(self.static, "css", "site.css"),
+                os.path.join(self.static, "images", "dot.gif"),
+            ],
+        )
+
+    def test_relative_urls_are_rewritten(self):
+        self.write("css/site.css", "a { background: url('../images/big.gif') }")
+        # Unquoted attributes are left alone
+        html = '<link href="/css/site.css" rel=stylesheet>'
+        self.assertEqual(self.assets.inline_html(html), (html, []))
+
+        html = '<link href="/css/site.css" rel="stylesheet">'
+        html, _ = self.assets.inline_html(html)
+        expected = '<style>a { background: url("/images/big.gif") }</style>'
+        self.assertEqual(html, expected)
+
+    def test_embedded_image_changes(self):
+        html = '<link rel="stylesheet" href="/css/site.css">'
+        before, _ = self.assets.inline_html(html)
+        self.assertIn(GIF_URI, before)
+
+        self.write("images/dot.gif", GIF + b"\x00")
+        after, _ = self.assets.inline_html(html)
+        self.assertNotIn(GIF_URI, after)
+        self.assertIn("data:image/gif;base64,", after)
+
+        # Growing past the limit falls back to the url
+        self.write("images/dot.gif", GIF * 10)
+        html, _ = self.assets.inline_html(html)
+        self.assertIn('url("/images/dot.gif")', html)
+
+    def test_stylesheet_over_limit(self):
+        self.write("css/site.css", "a {}" * 1024)
+        html = '<link rel="stylesheet" href="/css/site.css">'
+        self.assertEqual(self.assets.inline_html(html), (html, []))
+
+    def test_inline_images(self):
+        node = ParentNode(
+            "p",
+            [
+                LeafNode("img", "", {"src": "/images/dot.gif", "alt": "dot"}),
+                LeafNode("img", "", {"src": "/images/big.gif", "alt": "big"}),
+            ],
+        )
+        self.assets.inline_images(node)
+        self.assertEqual(node.children[0].props["src"], GIF_URI)
+        self.assertEqual(node.children[1].props["src"], "/images/big.gif")
+
+
+class InlinedTemplateTests(unittest.TestCase):
+    def test_single_substitution_pass(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "site.css"), "w") as file:
+                file.write("/* {{ Title }} */")
+            assets = AssetInliner(tmp, css_limit=1024)
+            template = Template(
+                '<title>{{ Title }}</title><link rel="stylesheet" href="/site.css">',
+                assets=assets,
+            )
+            self.assertEqual(template.placeholders(), ["Title"])
+            self.assertEqual(
+                template.render(Title="Hi"),
+                "<title>Hi</title><style>/* {{ Title }} */</style>",
+            )
+
+    def test_template_reloads_when_css_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            css = os.path.join(tmp, "site.css")
+            with open(css, "w") as file:
+                file.write("a {}")
+            path = os.path.join(tmp, "template.html")
+            with open(path, "w") as file:
+                file.write('<link rel="stylesheet" href="/site.css">{{ Content }}')
+
+            assets = AssetInliner(tmp, css_limit=1024)
+            template = load_template(path, assets=assets)
+            self.assertIs(load_template(path, assets=assets), template)
+
+            with open(css, "w") as file:
+                file.write("a { color: red }")
+            reloaded = load_template(path, assets=assets)
+            self.assertIsNot(reloaded, template)
+            self.assertIn("color: red", reloaded.render(Content=""))
+
+    def test_template_reloads_when_embedded_image_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "site.css"), "w") as file:
+                file.write("a { background: url(/dot.gif) }")
+            image = os.path.join(tmp, "dot.gif")
+            with open(image, "wb") as file:
+                file.write(GIF)
+            path = os.path.join(tmp, "template.html")
+            with open(path, "w") as file:
+                file.write('<link rel="stylesheet" href="/site.css">{{ Content }}')
+
+            assets = AssetInliner(tmp, css_limit=1024, image_limit=1024)
+            template = load_template(path, assets=assets)
+            self.assertIn(GIF_URI, template.render(Content=""))
+
+            with open(image, "wb") as file:
+                file.write(GIF + b"\x00")
+            reloaded = load_template(path, assets=assets)
+            self.assertNotIn(GIF_URI, reloaded.render(Content=""))
+
+
+if __name__ == "__main__":
+    unittest.main()
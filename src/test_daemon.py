@@ -0,0 +1,147 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from client import send
+from daemon import Builder, BuildServer
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        file.write(text)
+
+
+def read(path):
+    with open(path, "r") as file:
+        return file.read()
+
+
+class BuilderTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        write(self.path("content", "index.md"), "# Home\n\n[About](/about)")
+        write(self.path("content", "about", "index.md"), "# About\n\nHello")
+        write(self.path("static", "index.css"), "body {}")
+        write(self.path("template.html"), "<title>{{ Title }}</title>{{ Content }}")
+        self.builder = Builder(
+            content=self.path("content"),
+            static=self.path("static"),
+            template=self.path("template.html"),
+            dest=self.path("public"),
+            base_url="https://example.com",
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def test_full_build_reuses_cache(self):
+        response = self.builder.handle({"command": "build"})
+        self.assertTrue(response["ok"])
+        self.assertEqual(response["timings"]["rendered"], 2)
+        expected = "<title>About</title><div><h1>About</h1><p>Hello</p></div>"
+        self.assertEqual(read(self.path("public", "about", "index.html")), expected)
+        self.assertTrue(os.path.exists(self.path("public", "sitemap.xml")))
+
+        response = self.builder.handle({"command": "build"})
+        self.assertEqual(response["timings"]["rendered"], 0)
+        self.assertEqual(response["timings"]["cached"], 2)
+        self.assertTrue(os.path.exists(self.path("public", "index.css")))
+
+    def test_rebuild_paths(self):
+        self.builder.handle({"command": "build"})
+
+        write(self.path("content", "about", "index.md"), "# About us\n\nHi there")
+        write(self.path("content", "new.md"), "# New")
+        os.remove(self.path("content", "index.md"))
+        paths = [
+            self.path("content", "about", "index.md"),
+            self.path("content", "new.md"),
+            self.path("content", "index.md"),
+        ]
+        response = self.builder.handle({"command": "rebuild", "paths": paths})
+        self.assertEqual(response["timings"]["rendered"], 2)
+
+        self.assertIn("About us", read(self.path("public", "about", "index.html")))
+        self.assertTrue(os.path.exists(self.path("public", "new.html")))
+        self.assertFalse(os.path.exists(self.path("public", "index.html")))
+        self.assertEqual(
+            sorted(self.builder.manifest.pages), ["about/index.html", "new.html"]
+        )
+        self.assertIn("new.html", read(self.path("public", "sitemap.xml")))
+
+    def test_rebuild_deleted_static_dir(self):
+        write(self.path("static", "img", "a.png"), "png")
+        self.builder.handle({"command": "build"})
+
+        shutil.rmtree(self.path("static", "img"))
+        paths = [self.path("static", "img")]
+        response = self.builder.handle({"command": "rebuild", "paths": paths})
+        self.assertTrue(response["ok"])
+        self.assertFalse(os.path.exists(self.path("public", "img")))
+        self.assertNotIn("img/a.png", self.builder.manifest.outputs)
+
+    def test_rebuild_deleted_content_dir(self):
+        self.builder.handle({"command": "build"})
+
+        shutil.rmtree(self.path("content", "about"))
+        paths = [self.path("content", "about")]
+        response = self.builder.handle({"command": "rebuild", "paths": paths})
+        self.assertTrue(response["ok"])
+        self.assertFalse(os.path.exists(self.path("public", "about")))
+        self.assertEqual(sorted(self.builder.manifest.pages), ["index.html"])
+        self.assertNotIn("about", read(self.path("public", "sitemap.xml")))
+
+    def test_template_change_rebuilds_everything(self):
+        self.builder.handle({"command": "build"})
+        write(self.path("template.html"), "<h2>{{ Title }}</h2>{{ Content }}")
+        paths = [self.path("template.html")]
+        response = self.builder.handle({"command": "rebuild", "paths": paths})
+        self.assertEqual(response["timings"]["rendered"], 2)
+        self.assertTrue(read(self.path("public", "index.html")).startswith("<h2>"))
+
+    def test_unknown_path(self):
+        self.builder.handle({"command": "build"})
+        with self.assertRaises(Exception):
+            self.builder.handle({"command": "rebuild", "paths": ["elsewhere.md"]})
+
+
+class BuildServerTests(unittest.TestCase):
+    def test_socket_requests(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            write(os.path.join(tmp, "content", "index.md"), "# Home")
+            os.mkdir(os.path.join(tmp, "static"))
+            write(os.path.join(tmp, "template.html"), "{{ Content }}")
+            builder = Builder(
+                content=os.path.join(tmp, "content"),
+                static=os.path.join(tmp, "static"),
+                template=os.path.join(tmp, "template.html"),
+                dest=os.path.join(tmp, "public"),
+                base_url="https://example.com",
+            )
+            socket_path = os.path.join(tmp, "build.sock")
+            server = BuildServer(socket_path, builder)
+            thread = threading.Thread(target=server.serve_until_shutdown)
+            thread.start()
+
+            try:
+                self.assertEqual(send({"command": "ping"}, socket_path), {"ok": True})
+                response = send({"command": "build"}, socket_path)
+                self.assertTrue(response["ok"])
+                self.assertIn("total", response["timings"])
+                response = send({"command": "nope"}, socket_path)
+                self.assertFalse(response["ok"])
+            finally:
+                send({"command": "shutdown"}, socket_path)
+                thread.join()
+            self.assertFalse(os.path.exists(socket_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
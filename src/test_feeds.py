@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from feeds import (
+    ATOM_NS,
+    SITEMAP_NS,
+    AtomWriter,
+    SiteFeeds,
+    SitemapWriter,
+    page_url,
+)
+
+
+def parse(dir, name):
+    return ET.parse(os.path.join(dir, name)).getroot()
+
+
+class PageUrlTests(unittest.TestCase):
+    def test_page_url(self):
+        base = "https://example.com/"
+        self.assertEqual(page_url(base, "index.html"), "https://example.com/")
+        self.assertEqual(page_url(base, "a/index.html"), "https://example.com/a/")
+        self.assertEqual(page_url(base, "a/b.html"), "https://example.com/a/b.html")
+
+
+class SitemapTests(unittest.TestCase):
+    def test_single_sitemap(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            sitemap = SitemapWriter(tmp, "https://example.com")
+            sitemap.add("https://example.com/?a=1&b=2", 0)
+            self.assertEqual(sitemap.close(), ["sitemap.xml"])
+            self.assertEqual(os.listdir(tmp), ["sitemap.xml"])
+
+            root = parse(tmp, "sitemap.xml")
+            self.assertEqual(root.tag, f"{{{SITEMAP_NS}}}urlset")
+            locs = [loc.text for loc in root.iter(f"{{{SITEMAP_NS}}}loc")]
+            self.assertEqual(locs, ["https://example.com/?a=1&b=2"])
+
+    def test_sitemap_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            sitemap = SitemapWriter(tmp, "https://example.com", max_urls=2)
+            for i in range(5):
+                sitemap.add(f"https://example.com/{i}.html", 0)
+            files = sitemap.close()
+            expected = ["sitemap-1.xml", "sitemap-2.xml", "sitemap-3.xml"]
+            self.assertEqual(files, expected + ["sitemap.xml"])
+
+            root = parse(tmp, "sitemap.xml")
+            self.assertEqual(root.tag, f"{{{SITEMAP_NS}}}sitemapindex")
+            locs = [loc.text for loc in root.iter(f"{{{SITEMAP_NS}}}loc")]
+            self.assertEqual(locs, [f"https://example.com/{f}" for f in expected])
+
+            counts = [len(parse(tmp, name)) for name in expected]
+            self.assertEqual(counts, [2, 2, 1])
+
+
+class AtomTests(unittest.TestCase):
+    def test_keeps_most_recent(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            atom = AtomWriter(tmp, "https://example.com", max_entries=3)
+            atom.add("https://example.com/", "Home &amp; <b>more</b>", 10)
+            for i in range(10):
+                atom.add(f"https://example.com/{i}.html", f"Page {i}", i)
+            atom.close()
+
+            root = parse(tmp, "atom.xml")
+            title = root.find(f"{{{ATOM_NS}}}title")
+            self.assertEqual(title.text, "Home &amp; <b>more</b>")
+            entries = root.iter(f"{{{ATOM_NS}}}entry")
+            ids = [entry.find(f"{{{ATOM_NS}}}id").text for entry in entries]
+            expected = [
+                "https://example.com/",
+                "https://example.com/9.html",
+                "https://example.com/8.html",
+            ]
+            self.assertEqual(ids, expected)
+
+
+class SiteFeedsTests(unittest.TestCase):
+    def test_site_feeds(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            feeds = SiteFeeds(tmp, "https://example.com")
+            feeds.add_page(os.path.join(tmp, "index.html"), "Home", 0)
+            feeds.add_page(os.path.join(tmp, "a", "index.html"), "A", 1)
+            self.assertEqual(feeds.close(), ["sitemap.xml", "atom.xml"])
+
+            root = parse(tmp, "sitemap.xml")
+            locs = [loc.text for loc in root.iter(f"{{{SITEMAP_NS}}}loc")]
+            self.assertEqual(locs, ["https://example.com/", "https://example.com/a/"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from highlight import highlight
+
+
+class HighlightTests(unittest.TestCase):
+    def test_python(self):
+        code = 'def f(x):\n    # a *comment*\n    return "a#b" + 3.5'
+        expected = (
+            ("keyword", "def"),
+            (None, " f(x):\n    "),
+            ("comment", "# a *comment*"),
+            (None, "\n    "),
+            ("keyword", "return"),
+            (None, " "),
+            ("string", '"a#b"'),
+            (None, " + "),
+            ("number", "3.5"),
+        )
+        self.assertEqual(highlight("python", code), expected)
+
+    def test_aliases(self):
+        code = "const x = `a ${b}`; // done"
+        self.assertEqual(highlight("js", code), highlight("javascript", code))
+        self.assertEqual(highlight("JS", code)[0], ("keyword", "const"))
+
+    def test_bash(self):
+        code = 'echo "$HOME" $# # comment'
+        expected = (
+            ("builtin", "echo"),
+            (None, " "),
+            ("string", '"$HOME"'),
+            (None, " "),
+            ("variable", "$#"),
+            (None, " "),
+            ("comment", "# comment"),
+        )
+        self.assertEqual(highlight("sh", code), expected)
+
+    def test_unknown_language(self):
+        code = "some **code** here"
+        self.assertEqual(highlight("", code), ((None, code),))
+        self.assertEqual(highlight("cobol", code), ((None, code),))
+        self.assertEqual(highlight("", ""), ())
+
+    def test_tokens_cover_code(self):
+        code = "x = {'a': [1, 2]}  # done\nprint(x)\n"
+        tokens = highlight("python", code)
+        self.assertEqual("".join(text for _, text in tokens), code)
+
+    def test_cached(self):
+        code = "while True:\n    pass"
+        self.assertIs(highlight("python", code), highlight("python", code))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 
-from htmlnode import HTMLNode, LeafNode, ParentNode
+from htmlnode import HTMLNode, LeafNode, ParentNode, escape_attr, escape_text
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -9,6 +9,26 @@ class TestHTMLNode(unittest.TestCase):
         expected = ' href="https://www.google.com" target="_blank"'
         self.assertEqual(node.props_to_html(), expected)
 
+    def test_props_escaping(self):
+        node = HTMLNode(props={"href": '/search?q="a"&b=<c>', "width": 10})
+        expected = ' href="/search?q=&quot;a&quot;&amp;b=&lt;c&gt;" width="10"'
+        self.assertEqual(node.props_to_html(), expected)
+
+
+class TestEscaping(unittest.TestCase):
+    def test_escape_text(self):
+        expected = 'a &lt; b &amp;&amp; "c" &gt; d'
+        self.assertEqual(escape_text('a < b && "c" > d'), expected)
+        self.assertEqual(escape_text("&amp;"), "&amp;amp;")
+
+    def test_fast_path(self):
+        text = "nothing to escape here"
+        self.assertIs(escape_text(text), text)
+        self.assertIs(escape_attr(text), text)
+
+    def test_escape_attr(self):
+        self.assertEqual(escape_attr("x\"y'<&>"), "x&quot;y'&lt;&amp;&gt;")
+
 
 class TestLeafNode(unittest.TestCase):
     def test_leaf_to_html(self):
@@ -23,6 +43,12 @@ class TestLeafNode(unittest.TestCase):
         for node, exp in zip(nodes, expected):
             self.assertEqual(node.to_html(), exp)
 
+    def test_leaf_escaping(self):
+        node = LeafNode("code", "if a < b && c:")
+        self.assertEqual(node.to_html(), "<code>if a &lt; b &amp;&amp; c:</code>")
+        node = LeafNode(None, "<script>")
+        self.assertEqual(node.to_html(), "&lt;script&gt;")
+
     def test_leaf_image(self):
         node = LeafNode(
             tag="img", value="", props={"alt": "sample image", "src": "dir/some.png"}
@@ -65,6 +91,25 @@ class TestParentNode(unittest.TestCase):
         )
         self.assertEqual(node.to_html(), expected)
 
+    def test_minify(self):
+        node = ParentNode(
+            "div",
+            [
+                ParentNode(
+                    "p", [LeafNode(None, "Some\n   text  "), LeafNode("b", "a  b")]
+                ),
+                ParentNode("pre", [ParentNode("code", [LeafNode(None, "x = 1\n  y")])]),
+                ParentNode("p", [LeafNode("code", "a  b")]),
+            ],
+        )
+        expected = (
+            "<div><p>Some text <b>a b</b></p>"
+            "<pre><code>x = 1\n  y</code></pre>"
+            "<p><code>a  b</code></p></div>"
+        )
+        self.assertEqual(node.to_html(minify=True), expected)
+        self.assertIn("Some\n   text  ", node.to_html())
+
 
 if __name__ == "__main__":
     unittest.main()
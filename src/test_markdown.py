@@ -160,11 +160,61 @@ This is the same paragraph on a new line
         ]
         self.assertEqual(blocks, expected)
 
+    def test_md_to_block_fenced_code(self):
+        text = """Some code
+
+```python
+x = 1
+
+
+y = 2
+```
+
+After the code
+"""
+        blocks = markdown_to_blocks(text)
+        expected = [
+            "Some code",
+            "```python\nx = 1\n\n\ny = 2\n```",
+            "After the code",
+        ]
+        self.assertEqual(blocks, expected)
+
+    def test_md_to_block_inline_backticks(self):
+        text = "```inline``` is how you write code\n\n# Heading\n\nAnother paragraph"
+        expected = [
+            "```inline``` is how you write code",
+            "# Heading",
+            "Another paragraph",
+        ]
+        self.assertEqual(markdown_to_blocks(text), expected)
+
+    def test_md_to_block_unclosed_fence(self):
+        text = "```python\nx = 1\n\n# Heading\n\nAnother paragraph"
+        expected = ["```python\nx = 1", "# Heading", "Another paragraph"]
+        self.assertEqual(markdown_to_blocks(text), expected)
+
+    def test_md_to_block_text_after_closing_fence(self):
+        text = (
+            "# Title\n\n```python\nx = 1\n```\nThat was python.\n\n"
+            "## Next section\n\n```\ny = 2\n```"
+        )
+        expected = [
+            "# Title",
+            "```python\nx = 1\n```\nThat was python.",
+            "## Next section",
+            "```\ny = 2\n```",
+        ]
+        self.assertEqual(markdown_to_blocks(text), expected)
+        html = markdown_to_html_node(text).to_html()
+        self.assertIn("<h2>Next section</h2>", html)
+
     def test_block_type_parsing(self):
         blocks = [
             "#### This is a header",
             "This is **bolded** paragraph",
             "```\npython some_script.py\n```",
+            "```python\nimport os\n```",
             "This is another paragraph with *italic* text and `code` here\nThis is the same paragraph on a new line",
             "> Quotes\n> And more quotes\n> And more quotes",
             "* This is a list\n* with items",
@@ -174,6 +224,7 @@ This is the same paragraph on a new line
             Block.Heading,
             Block.Paragraph,
             Block.Code,
+            Block.Code,
             Block.Paragraph,
             Block.Quote,
             Block.UnorderedList,
@@ -284,6 +335,32 @@ python some_scripts.py
         result = markdown_to_html_node(text)
         self.assertEqual(result, expected)
 
+    def test_code_block_verbatim(self):
+        text = "```python\nx = a * b * `c`  # **not bold**\n```"
+        expected = ParentNode(
+            tag="div",
+            children=[
+                ParentNode(
+                    tag="pre",
+                    children=[
+                        ParentNode(
+                            tag="code",
+                            props={"class": "language-python"},
+                            children=[
+                                LeafNode(value="x = a * b * `c`  "),
+                                LeafNode(
+                                    tag="span",
+                                    value="# **not bold**",
+                                    props={"class": "tok-comment"},
+                                ),
+                            ],
+                        )
+                    ],
+                )
+            ],
+        )
+        self.assertEqual(markdown_to_html_node(text), expected)
+
 
 if __name__ == "__main__":
     unittest.main()
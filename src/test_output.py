@@ -0,0 +1,149 @@
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import unittest
+import zipfile
+
+from output import DirectoryOutput, TarOutput, ZipOutput, open_output
+from shard import list_files
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "src", "main.py")
+
+
+def write_site(output, root):
+    output.make_dir(root, clean=True)
+    output.make_dir(os.path.join(root, "a"))
+    output.write_text(os.path.join(root, "index.html"), "<p>home</p>")
+    output.write_text(os.path.join(root, "a", "index.html"), "<p>a</p>")
+    output.write_fileobj(io.BytesIO(b"<urlset/>"), os.path.join(root, "sitemap.xml"))
+    output.close()
+
+
+def read(path):
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def copy_site(dest):
+    # A copy of the example site that tests can change
+    for name in ["content", "static"]:
+        shutil.copytree(os.path.join(ROOT, name), os.path.join(dest, name))
+    shutil.copy(os.path.join(ROOT, "template.html"), dest)
+
+
+class OutputTests(unittest.TestCase):
+    def test_open_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = open_output(os.path.join(tmp, "public"))
+            self.assertIsInstance(output, DirectoryOutput)
+            for name, kind in [
+                ("site.tar", TarOutput),
+                ("site.tar.gz", TarOutput),
+                ("site.tgz", TarOutput),
+                ("site.zip", ZipOutput),
+            ]:
+                output = open_output(os.path.join(tmp, name))
+                self.assertIsInstance(output, kind)
+                output.close()
+
+    def test_directory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = os.path.join(tmp, "public")
+            write_site(DirectoryOutput(), root)
+            expected = ["a/index.html", "index.html", "sitemap.xml"]
+            self.assertEqual(list_files(root), expected)
+            self.assertEqual(read(os.path.join(root, "sitemap.xml")), b"<urlset/>")
+
+    def test_tar(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "site.tar.gz")
+            write_site(TarOutput(path, compress=True), path)
+            with tarfile.open(path) as tar:
+                members = tar.getmembers()
+                names = [member.name for member in members]
+                self.assertEqual(names, ["index.html", "a/index.html", "sitemap.xml"])
+                self.assertEqual(tar.extractfile("a/index.html").read(), b"<p>a</p>")
+                for member in members:
+                    self.assertEqual(member.mtime, 315532800)
+                    self.assertEqual(member.mode, 0o644)
+
+    def test_zip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "site.zip")
+            write_site(ZipOutput(path), path)
+            with zipfile.ZipFile(path) as archive:
+                names = archive.namelist()
+                self.assertEqual(names, ["index.html", "a/index.html", "sitemap.xml"])
+                self.assertEqual(archive.read("sitemap.xml"), b"<urlset/>")
+                for info in archive.infolist():
+                    self.assertEqual(info.date_time, (1980, 1, 1, 0, 0, 0))
+
+    def test_duplicate_member(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "site.tar")
+            output = TarOutput(path)
+            output.write_text(os.path.join(path, "index.html"), "a")
+            with self.assertRaises(Exception):
+                output.write_text(os.path.join(path, "index.html"), "b")
+            output.close()
+
+
+class ArchiveBuildTests(unittest.TestCase):
+    def build(self, out, epoch=None, cwd=ROOT):
+        env = dict(os.environ)
+        if epoch is not None:
+            env["SOURCE_DATE_EPOCH"] = str(epoch)
+        subprocess.run(
+            [sys.executable, MAIN, "--out", out],
+            cwd=cwd,
+            env=env,
+            check=True,
+            capture_output=True,
+        )
+
+    def test_archives_are_reproducible(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            public = os.path.join(tmp, "public")
+            self.build(public)
+
+            for name in ["site.tar", "site.tar.gz", "site.zip"]:
+                first = os.path.join(tmp, f"first-{name}")
+                second = os.path.join(tmp, f"second-{name}")
+                self.build(first)
+                self.build(second)
+                self.assertEqual(read(first), read(second), name)
+
+            with tarfile.open(os.path.join(tmp, "first-site.tar.gz")) as tar:
+                names = sorted(tar.getnames())
+                self.assertEqual(names, list_files(public))
+                for name in names:
+                    expected = read(os.path.join(public, name))
+                    self.assertEqual(tar.extractfile(name).read(), expected, name)
+
+    def test_source_date_epoch(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "site.tar")
+            self.build(path, epoch=1700000000)
+            with tarfile.open(path) as tar:
+                mtimes = {member.mtime for member in tar.getmembers()}
+            self.assertEqual(mtimes, {1700000000})
+
+    def test_touched_sources_are_reproducible(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            site = os.path.join(tmp, "site")
+            copy_site(site)
+            first = os.path.join(tmp, "first.tar")
+            second = os.path.join(tmp, "second.tar")
+            self.build(first, epoch=1700000000, cwd=site)
+            os.utime(os.path.join(site, "content", "index.md"))
+            self.build(second, epoch=1700000000, cwd=site)
+            self.assertEqual(read(first), read(second))
+
+
+if __name__ == "__main__":
+    unittest.main()
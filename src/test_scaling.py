@@ -0,0 +1,143 @@
+import math
+import time
+import timeit
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+from markdown import (
+    block_to_block_type,
+    markdown_to_blocks,
+    markdown_to_html_node,
+    split_nodes_image,
+    split_nodes_link,
+    text_to_textnodes,
+)
+from textnode import TextNode, TextType
+
+# Input sizes double from the base size, so the largest is 8x the smallest
+DOUBLINGS = 3
+REPEAT = 2
+# Each sample loops the stage for at least this much cpu time, so that
+# timer resolution and cache warmup are negligible
+MIN_SAMPLE = 0.05
+# Linear growth has an exponent of 1, quadratic of 2. Timing noise on
+# shared CI machines easily skews a single doubling, so we only fit the
+# overall growth and leave a generous margin.
+MAX_EXPONENT = 1.5
+
+
+def timer(func, arg):
+    # NOTE: process time, not wall time, other processes competing for the
+    # cpu must not count against the stage
+    return timeit.Timer(lambda: func(arg), timer=time.process_time)
+
+
+def calibrate(func, arg):
+    number = 1
+    while (seconds := timer(func, arg).timeit(number)) < MIN_SAMPLE / 10:
+        number *= 10
+    return max(1, math.ceil(number * MIN_SAMPLE / seconds))
+
+
+def measure(func, arg, number):
+    # Time per call, the best of a few samples
+    samples = timer(func, arg).repeat(repeat=REPEAT, number=number)
+    return min(samples) / number
+
+
+def growth_exponent(func, make_input, base_size):
+    times = []
+    number = None
+    for i in range(DOUBLINGS + 1):
+        arg = make_input(base_size * 2**i)
+        if number is None:
+            number = calibrate(func, arg)
+        # At least linear growth keeps larger samples above MIN_SAMPLE
+        times.append(measure(func, arg, max(1, number >> i)))
+    return math.log(times[-1] / times[0], 2) / DOUBLINGS, times
+
+
+def paragraph_with_links(count):
+    text = "see [a link](https://example.com/page) and " * count
+    return [TextNode(text, TextType.Text)]
+
+
+def paragraph_with_images(count):
+    text = "see ![an image](/images/a.png) and " * count
+    return [TextNode(text, TextType.Text)]
+
+
+def wide_parent(count):
+    children = [LeafNode("b", "bold text") for _ in range(count)]
+    return ParentNode("div", [ParentNode("p", children)])
+
+
+def deep_parent(depth):
+    node = LeafNode("b", "bold text")
+    for _ in range(depth):
+        node = ParentNode("span", [node, LeafNode(None, "text")])
+    return node
+
+
+def ordered_list(count):
+    return "\n".join(f"{i + 1}. item number {i + 1}" for i in range(count))
+
+
+def unordered_list(count):
+    return "\n".join("* an *item* with `code`" for _ in range(count))
+
+
+def many_blocks(count):
+    block = "## Heading\n\nSome **bold** text and [a link](/url)\n\n* a\n* list"
+    return "\n\n".join(block for _ in range(count))
+
+
+def long_code_fence(count):
+    return "```python\n" + "\n\n".join("x = 1" for _ in range(count)) + "\n```"
+
+
+class ScalingTests(unittest.TestCase):
+    def assertLinear(self, func, make_input, base_size):
+        exponent, times = growth_exponent(func, make_input, base_size)
+        if exponent > MAX_EXPONENT:
+            # Retry once before failing, a single slow run is likely noise
+            exponent, times = growth_exponent(func, make_input, base_size)
+        timings = ", ".join(f"{t * 1000:.3f}ms" for t in times)
+        self.assertLessEqual(
+            exponent,
+            MAX_EXPONENT,
+            f"growth exponent {exponent:.2f} over doubling sizes ({timings} per call)",
+        )
+
+    def test_split_nodes_link(self):
+        self.assertLinear(split_nodes_link, paragraph_with_links, 4000)
+
+    def test_split_nodes_image(self):
+        self.assertLinear(split_nodes_image, paragraph_with_images, 4000)
+
+    def test_text_to_textnodes(self):
+        text = "some **bold** and *italic* with `code` and [a](/b) ![c](/d) "
+        self.assertLinear(text_to_textnodes, lambda n: text * n, 200)
+
+    def test_parent_to_html_wide(self):
+        self.assertLinear(lambda node: node.to_html(), wide_parent, 2000)
+
+    def test_parent_to_html_deep(self):
+        # NOTE: stays clear of the recursion limit
+        self.assertLinear(lambda node: node.to_html(), deep_parent, 100)
+
+    def test_block_to_block_type_lists(self):
+        self.assertLinear(block_to_block_type, ordered_list, 2000)
+        self.assertLinear(block_to_block_type, unordered_list, 2000)
+
+    def test_markdown_to_blocks(self):
+        self.assertLinear(markdown_to_blocks, many_blocks, 1000)
+        self.assertLinear(markdown_to_blocks, long_code_fence, 1000)
+
+    def test_markdown_to_html_node(self):
+        self.assertLinear(markdown_to_html_node, many_blocks, 100)
+        self.assertLinear(markdown_to_html_node, unordered_list, 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from shard import (
+    MANIFEST_NAME,
+    Manifest,
+    Shard,
+    list_files,
+    merge_shards,
+    parse_shard,
+    shard_of,
+    write_shard_manifest,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "src", "main.py")
+
+
+def run_main(*args, cwd=ROOT):
+    subprocess.run(
+        [sys.executable, MAIN, *args], cwd=cwd, check=True, capture_output=True
+    )
+
+
+def copy_site(dest):
+    # A copy of the example site that tests can change
+    for name in ["content", "static"]:
+        shutil.copytree(os.path.join(ROOT, name), os.path.join(dest, name))
+    shutil.copy(os.path.join(ROOT, "template.html"), dest)
+
+
+class ShardTests(unittest.TestCase):
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("0/1"), (0, 1))
+        self.assertEqual(parse_shard("3/4"), (3, 4))
+        for spec in ["4/4", "-1/4", "1/0", "1", "a/b"]:
+            with self.assertRaises(ValueError):
+                parse_shard(spec)
+
+    def test_shard_of_is_stable(self):
+        path = "content/majesty/index.md"
+        self.assertEqual(shard_of(path, 7), shard_of("content/./majesty/index.md", 7))
+        code = f"from shard import shard_of; print(shard_of({path!r}, 7))"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.join(ROOT, "src"),
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(int(result.stdout), shard_of(path, 7))
+
+
+class ShardedBuildTests(unittest.TestCase):
+    def test_sharded_build_matches_full_build(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            site = os.path.join(tmp, "site")
+            copy_site(site)
+            # 'a-b.html' sorts before 'a/index.html', but is generated after it
+            for name in ["a/index.md", "a-b.md"]:
+                path = os.path.join(site, "content", name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w") as file:
+                    file.write(f"# {name}\n\nText")
+
+            full = os.path.join(tmp, "full")
+            manifest = os.path.join(tmp, "full.json")
+            run_main("--out", full, "--manifest", manifest, cwd=site)
+
+            count = 3
+            shards = [os.path.join(tmp, f"shard-{i}") for i in range(count)]
+            procs = [
+                subprocess.Popen(
+                    [sys.executable, MAIN, "--shard", f"{i}/{count}", "--out", out],
+                    cwd=site,
+                    stdout=subprocess.DEVNULL,
+                )
+                for i, out in enumerate(shards)
+            ]
+            for proc in procs:
+                self.assertEqual(proc.wait(), 0)
+
+            merged = os.path.join(tmp, "merged")
+            manifest = os.path.join(tmp, "merged.json")
+            run_main(
+                "--merge", *shards, "--out", merged, "--manifest", manifest, cwd=site
+            )
+
+            self.assertEqual(list_files(merged), list_files(full))
+            for path in list_files(full):
+                with open(os.path.join(full, path), "rb") as a:
+                    with open(os.path.join(merged, path), "rb") as b:
+                        self.assertEqual(a.read(), b.read(), path)
+
+            expected = Manifest.read(os.path.join(tmp, "full.json"))
+            result = Manifest.read(os.path.join(tmp, "merged.json"))
+            self.assertEqual(result, expected)
+            self.assertEqual(
+                result.pages["majesty/index.html"]["title"],
+                'The Unparalleled Majesty of "The Lord of the Rings"',
+            )
+            self.assertIn("/", result.pages["majesty/index.html"]["links"])
+
+    def test_merge_without_sources(self):
+        # Shards may be merged on another machine, away from the sources
+        with tempfile.TemporaryDirectory() as tmp:
+            shard = os.path.join(tmp, "shard")
+            run_main("--shard", "0/1", "--out", shard)
+            merged = os.path.join(tmp, "merged")
+            subprocess.run(
+                [sys.executable, MAIN, "--merge", shard, "--out", merged],
+                cwd=tmp,
+                check=True,
+                capture_output=True,
+            )
+            self.assertIn("sitemap.xml", list_files(merged))
+
+    def test_merge_detects_collisions(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            shards = []
+            for i in range(2):
+                out = os.path.join(tmp, f"shard-{i}")
+                os.mkdir(out)
+                with open(os.path.join(out, "index.html"), "w") as file:
+                    file.write(f"shard {i}")
+                manifest = Manifest(out, shard=Shard(i, 2))
+                manifest.add_output(os.path.join(out, "index.html"), "content/index.md")
+                write_shard_manifest(manifest, out)
+                shards.append(out)
+
+            with self.assertRaises(Exception):
+                merge_shards(shards, os.path.join(tmp, "merged"))
+            self.assertFalse(os.path.exists(os.path.join(tmp, "merged")))
+
+    def test_site_manifest_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            shards = []
+            for i, name in enumerate(["manifest.json", "index.html"]):
+                out = os.path.join(tmp, f"shard-{i}")
+                os.mkdir(out)
+                with open(os.path.join(out, name), "w") as file:
+                    file.write("{}")
+                manifest = Manifest(out, shard=Shard(i, 2))
+                manifest.add_output(os.path.join(out, name), f"static/{name}")
+                write_shard_manifest(manifest, out)
+                shards.append(out)
+
+            merged = merge_shards(shards, os.path.join(tmp, "merged"))
+            self.assertEqual(sorted(merged.outputs), ["index.html", "manifest.json"])
+            files = list_files(os.path.join(tmp, "merged"))
+            self.assertEqual(files, ["index.html", "manifest.json"])
+
+    def test_shard_manifest_collision(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = Manifest(tmp, shard=Shard(0, 1))
+            path = os.path.join(tmp, MANIFEST_NAME)
+            manifest.add_output(path, f"static/{MANIFEST_NAME}")
+            with self.assertRaises(Exception):
+                write_shard_manifest(manifest, tmp)
+
+    def make_shards(self, tmp, specs):
+        shards = []
+        for i, (index, count) in enumerate(specs):
+            out = os.path.join(tmp, f"shard-{i}")
+            os.mkdir(out)
+            write_shard_manifest(Manifest(out, shard=Shard(index, count)), out)
+            shards.append(out)
+        return shards
+
+    def test_merge_checks_shards(self):
+        for specs in [
+            [(0, 3), (1, 3)],
+            [(0, 2), (1, 3), (2, 3)],
+            [(0, 2), (0, 2), (1, 2)],
+        ]:
+            with tempfile.TemporaryDirectory() as tmp:
+                shards = self.make_shards(tmp, specs)
+                with self.assertRaises(Exception, msg=specs):
+                    merge_shards(shards, os.path.join(tmp, "merged"))
+                self.assertFalse(os.path.exists(os.path.join(tmp, "merged")))
+
+    def test_shard_manifest_records_shard(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (out,) = self.make_shards(tmp, [(1, 3)])
+            shard = Manifest.read(os.path.join(out, MANIFEST_NAME)).shard
+            self.assertEqual((shard.index, shard.count), (1, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
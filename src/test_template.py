@@ -0,0 +1,49 @@
+import unittest
+
+from template import Template, minify_html
+
+
+class MinifyTests(unittest.TestCase):
+    def test_minify_between_blocks(self):
+        html = """<!DOCTYPE html>
+<html>
+
+<head>
+    <!-- a comment -->
+    <title> {{ Title }} </title>
+</head>
+<body>
+    <p>Some   <b>bold</b> <i>text</i></p>
+</body>
+</html>
+"""
+        expected = (
+            "<!DOCTYPE html><html><head><title>{{ Title }}</title></head>"
+            "<body><p>Some <b>bold</b> <i>text</i></p></body></html>"
+        )
+        self.assertEqual(minify_html(html), expected)
+
+    def test_minify_preserves_pre(self):
+        html = "<div>\n  <pre>\n  a\n    b</pre>\n</div>"
+        expected = "<div><pre>\n  a\n    b</pre></div>"
+        self.assertEqual(minify_html(html), expected)
+
+
+class TemplateTests(unittest.TestCase):
+    def test_render(self):
+        template = Template("<title>{{ Title }}</title><p>{{Content}}</p>")
+        self.assertEqual(template.placeholders(), ["Title", "Content"])
+        result = template.render(Title="Hi", Content="{{ Title }}")
+        self.assertEqual(result, "<title>Hi</title><p>{{ Title }}</p>")
+
+    def test_versions_are_unique(self):
+        versions = {Template("{{ Content }}").version for _ in range(3)}
+        self.assertEqual(len(versions), 3)
+
+    def test_missing_value(self):
+        with self.assertRaises(Exception):
+            Template("{{ Title }}").render(Content="")
+
+
+if __name__ == "__main__":
+    unittest.main()